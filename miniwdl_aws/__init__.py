@@ -1,3 +1,18 @@
-from .batch_job import BatchJob, BatchJobNoEFS  # noqa: F401
-from .cli_run_s3upload import miniwdl_run_s3upload  # noqa: F401
-from .cli_submit import miniwdl_submit_awsbatch  # noqa: F401
+import importlib
+
+# Import submodules lazily (PEP 562), so that e.g. `miniwdl-aws-submit --help` needn't wait to load
+# miniwdl and boto3
+_EXPORTS = {
+    "BatchJob": ".batch_job",
+    "BatchJobNoEFS": ".batch_job",
+    "miniwdl_run_s3upload": ".cli_run_s3upload",
+    "miniwdl_submit_awsbatch": ".cli_submit",
+    "miniwdl_aws_workflow_runner": ".cli_workflow_runner",
+}
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
@@ -1,11 +1,9 @@
 import os
-import boto3
+import functools
 import base64
 import json
 import uuid
-import requests
 import subprocess
-from WDL._util import StructuredLogMessage as _
 
 
 def detect_aws_region(cfg):
@@ -17,6 +15,15 @@ def detect_aws_region(cfg):
         if os.environ.get(ev):
             return os.environ[ev]
 
+    return _detect_default_aws_region()
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_default_aws_region():
+    # memoized since these checks may entail reading ~/.aws or an EC2 metadata round trip
+    import boto3
+    import requests
+
     # check boto3, which will load ~/.aws
     if boto3.DEFAULT_SESSION and boto3.DEFAULT_SESSION.region_name:
         return boto3.DEFAULT_SESSION.region_name
@@ -45,10 +52,13 @@ def randomize_job_name(job_name):
     )
 
 
-def efs_id_from_access_point(region_name, fsap_id):
+def efs_id_from_access_point(region_name, fsap_id, aws_efs=None):
     # Resolve the EFS access point id (fsap-xxxx) to the associated file system id (fs-xxxx). Saves
-    # user from having to specify both.
-    aws_efs = boto3.Session().client("efs", region_name=region_name)
+    # user from having to specify both. The caller may supply its own EFS client.
+    if not aws_efs:
+        import boto3
+
+        aws_efs = boto3.Session().client("efs", region_name=region_name)
     desc = aws_efs.describe_access_points(AccessPointId=fsap_id)
     assert len(desc.get("AccessPoints", [])) == 1
     desc = desc["AccessPoints"][0]
@@ -59,6 +69,9 @@ def efs_id_from_access_point(region_name, fsap_id):
 
 def detect_sagemaker_studio_efs(logger, **kwargs):
     # Detect if we're operating inside SageMaker Studio and if so, record EFS mount details
+    import boto3
+    from WDL._util import StructuredLogMessage as _
+
     METADATA_FILE = "/opt/ml/metadata/resource-metadata.json"
     metadata = None
     try:
@@ -105,6 +118,9 @@ def detect_sagemaker_studio_efs(logger, **kwargs):
 def detect_studio_fsap(logger, efs_id, efs_uid, efs_home, **kwargs):
     # Look for an Access Point with the appropriate configuration to mount the SageMaker Studio EFS
     # (in the same way it's presented through Studio)
+    import boto3
+    from WDL._util import StructuredLogMessage as _
+
     try:
         efs = boto3.client("efs", **kwargs)
         access_points = efs.describe_access_points(FileSystemId=efs_id, MaxResults=100).get(
@@ -146,6 +162,9 @@ def detect_studio_fsap(logger, efs_id, efs_uid, efs_home, **kwargs):
 
 def detect_gwfcore_batch_queue(logger, efs_id, **kwargs):
     # Look for a Batch job queue tagged with the Studio EFS id (indicating it's our default)
+    import boto3
+    from WDL._util import StructuredLogMessage as _
+
     try:
         batch = boto3.client("batch", **kwargs)
         queues = batch.describe_job_queues(maxResults=100).get("jobQueues", [])
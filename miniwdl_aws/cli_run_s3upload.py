@@ -246,11 +246,12 @@ def rebase_output_path(fn, run_dir, s3_upload_folder):
 def get_wdl_zip():
     """
     Load `miniwdl zip`ped WDL source code shipped to us by miniwdl-aws-submit, encoded in the
-    environment variable WDL_ZIP
+    environment variable WDL_ZIP (with any spillover in the workflow job's tags, if we're running
+    as one; miniwdl-aws-workflow-runner receives the whole thing in WDL_ZIP)
     """
 
     encoded_zip = os.environ["WDL_ZIP"]
-    if len(encoded_zip) >= 4096:
+    if len(encoded_zip) >= 4096 and "AWS_BATCH_JOB_ID" in os.environ:
         # Look for spillover in job & job def tags
         job_desc = json.loads(
             subprocess_run_with_clean_exit(
@@ -259,7 +260,7 @@ def get_wdl_zip():
                 check=True,
             ).stdout
         )["jobs"][0]
-        job_tags = job_desc["tags"]
+        job_tags = job_desc.get("tags", {})
         job_def_tags = json.loads(
             subprocess_run_with_clean_exit(
                 [
@@ -272,13 +273,18 @@ def get_wdl_zip():
                 stdout=subprocess.PIPE,
                 check=True,
             ).stdout
-        )["jobDefinitions"][0]["tags"]
+        )["jobDefinitions"][0].get("tags", {})
+        # (the job may have other tags, e.g. if we're under miniwdl-aws-workflow-runner in a Batch
+        # job not submitted by miniwdl-aws-submit)
+        job_tags, job_def_tags = (
+            {key: value for key, value in tags.items() if key.startswith("WZ") and len(key) > 3}
+            for tags in (job_tags, job_def_tags)
+        )
         # if no job_def_tags, then there shouldn't be job_tags either
         assert job_def_tags or not job_tags
         for tags in (job_def_tags, job_tags):
             for key in sorted(tags.keys()):
-                if key.startswith("WZ") and len(key) > 3:
-                    encoded_zip += key[3:] + tags[key]
+                encoded_zip += key[3:] + tags[key]
 
     import base64
     import lzma
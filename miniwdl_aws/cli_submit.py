@@ -8,12 +8,18 @@ stream its logs.
 
 import sys
 import os
+import re
 import time
+import json
+import hashlib
+import queue
+import collections
+import threading
+import random
 import argparse
+import concurrent.futures
 import shlex
 from datetime import datetime
-from collections import defaultdict
-import boto3
 from ._util import detect_aws_region, randomize_job_name, END_OF_LOG, efs_id_from_access_point
 
 
@@ -23,10 +29,6 @@ def miniwdl_submit_awsbatch(argv):
     verbose = (
         args.follow or args.self_test or "--verbose" in unused_args or "--debug" in unused_args
     )
-    detect_env_args(args)
-    if verbose:
-        print("Workflow job queue: " + args.workflow_queue, file=sys.stderr)
-
     aws_region_name = detect_aws_region(None)
     if not aws_region_name:
         print(
@@ -34,7 +36,23 @@ def miniwdl_submit_awsbatch(argv):
             file=sys.stderr,
         )
         sys.exit(1)
-    aws_batch = boto3.client("batch", region_name=aws_region_name)
+    aws_batch = aws_client("batch", aws_region_name)
+
+    if args.attach:
+        # wait for previously-submitted workflow job(s) instead of submitting
+        sys.exit(
+            wait(
+                aws_batch,
+                aws_client("logs", aws_region_name),
+                args.attach,
+                args.follow,
+                live_tail=args.live_tail,
+            )
+        )
+
+    detect_env_args(args)
+    if verbose:
+        print("Workflow job queue: " + args.workflow_queue, file=sys.stderr)
     detect_tags_args(aws_batch, args)
 
     if verbose:
@@ -43,43 +61,67 @@ def miniwdl_submit_awsbatch(argv):
             print("Workflow IAM role ARN: " + args.workflow_role, file=sys.stderr)
             print("EFS Access Point: " + args.fsap, file=sys.stderr)
 
-    fs_id = None
-    if args.efs:
-        fs_id = efs_id_from_access_point(aws_region_name, args.fsap)
-        if verbose:
-            print("EFS: " + fs_id, file=sys.stderr)
-
-    # Prepare workflow job: command, environment, and container properties
-    job_name, miniwdl_run_cmd, wdl_zip = form_miniwdl_run_cmd(args, unused_args, verbose)
+    # Prepare workflow job: command, environment, and container properties. In the background
+    # meanwhile, resolve the EFS file system ID and (if needed) set up the CloudWatch Logs client.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+        fs_id_future = (
+            pool.submit(
+                lambda: efs_id_from_access_point(
+                    aws_region_name, args.fsap, aws_client("efs", aws_region_name)
+                )
+            )
+            if args.efs
+            else None
+        )
+        aws_logs_future = (
+            pool.submit(aws_client, "logs", aws_region_name) if args.wait or args.follow else None
+        )
+        job_name, miniwdl_run_cmd, wdl_zip = form_miniwdl_run_cmd(args, unused_args, verbose)
+        fs_id = None
+        if fs_id_future:
+            fs_id = fs_id_future.result()
+            if verbose:
+                print("EFS: " + fs_id, file=sys.stderr)
     job_name = randomize_job_name(job_name)
     if verbose:
         print("Workflow job image: " + args.image, file=sys.stderr)
-        print("Invocation: " + " ".join(shlex.quote(s) for s in miniwdl_run_cmd), file=sys.stderr)
+        print("Invocation: " + shlex.join(miniwdl_run_cmd), file=sys.stderr)
     (
         workflow_container_props,
         workflow_container_overrides,
         job_def_tags,
         job_tags,
-    ) = form_workflow_container_props(args, miniwdl_run_cmd, fs_id, wdl_zip, verbose)
+    ) = form_workflow_container_props(
+        # the runner queue message carries any WDL zip whole, instead of spilling it into tags
+        args,
+        miniwdl_run_cmd,
+        fs_id,
+        None if args.runner_queue else wdl_zip,
+        verbose,
+    )
 
-    # Register & submit workflow job
-    try:
-        workflow_job_def = aws_batch.register_job_definition(
-            jobDefinitionName=job_name,
-            platformCapabilities=["FARGATE" if args.efs else "EC2"],
-            type="container",
-            containerProperties=workflow_container_props,
-            tags=job_def_tags,
+    if args.runner_queue:
+        sys.exit(
+            enqueue_workflow_run(
+                aws_client("sqs", aws_region_name),
+                args.runner_queue,
+                workflow_container_props,
+                workflow_container_overrides,
+                wdl_zip,
+                verbose,
+            )
         )
-    except BaseException as exc:
-        if wdl_zip and "JobDefinition size must be less than" in str(exc):
-            print(_WDL_ZIP_SIZE_MSG, file=sys.stderr)
-            sys.exit(123)
-        raise
-    workflow_job_def_handle = (
-        f"{workflow_job_def['jobDefinitionName']}:{workflow_job_def['revision']}"
+
+    # Register (or reuse) job definition & submit workflow job
+    workflow_job_def_handle, job_def_transient = register_workflow_job_def(
+        aws_batch, args, job_name, workflow_container_props, job_def_tags, wdl_zip, verbose
     )
+    notify_rule_name = workflow_job_id = None
     try:
+        if args.notify:
+            # set up the completion notification before submitting, so that a failure here
+            # doesn't leave behind a submitted job, and the rule can't miss a quick job's event
+            notify_rule_name = notify_on_completion(aws_region_name, job_name, args.notify)
         workflow_job_id = aws_batch.submit_job(
             jobName=job_name,
             jobQueue=args.workflow_queue,
@@ -93,22 +135,69 @@ def miniwdl_submit_awsbatch(argv):
         print(workflow_job_id)
         if not sys.stdout.isatty():
             print(workflow_job_id, file=sys.stderr)
+    except BaseException:
+        if notify_rule_name and not workflow_job_id:
+            delete_notify_rule(aws_region_name, notify_rule_name)
+        raise
     finally:
-        aws_batch.deregister_job_definition(jobDefinition=workflow_job_def_handle)
+        if job_def_transient:
+            try:
+                aws_batch.deregister_job_definition(jobDefinition=workflow_job_def_handle)
+            except aws_batch.exceptions.ClientError as exn:
+                # AWS expires job definitions after 6mo, so failing to delete them isn't fatal
+                print(
+                    f"Failed to deregister job definition {workflow_job_def_handle}: {exn}",
+                    file=sys.stderr,
+                )
 
     # Wait for workflow job, if requested
     exit_code = 0
     if args.wait or args.follow:
         exit_code = wait(
-            aws_region_name,
             aws_batch,
-            workflow_job_id,
+            aws_logs_future.result(),
+            [workflow_job_id],
             args.follow,
             expect_log_eof=not args.self_test,
+            live_tail=args.live_tail,
         )
     sys.exit(exit_code)
 
 
+def aws_client(service_name, region_name):
+    """
+    Get a boto3 client for the AWS service, created once (on a shared session) and reused for all
+    requests to it, including from other threads
+    """
+    # imported here instead of at top level, so that e.g. `--help` needn't wait to load boto3
+    import boto3
+    import botocore.config
+
+    global _aws_session
+    with _aws_clients_lock:
+        key = (service_name, region_name)
+        if key not in _aws_clients:
+            # boto3 clients are thread-safe, but creating them from a shared session isn't
+            if not _aws_session:
+                _aws_session = boto3.session.Session()
+            _aws_clients[key] = _aws_session.client(
+                service_name,
+                region_name=region_name,
+                config=botocore.config.Config(
+                    retries={"mode": "adaptive", "max_attempts": 10},
+                    tcp_keepalive=True,
+                    # room for the status poller, log fetches & a Live Tail stream per followed job
+                    max_pool_connections=50,
+                ),
+            )
+        return _aws_clients[key]
+
+
+_aws_session = None
+_aws_clients = {}
+_aws_clients_lock = threading.Lock()
+
+
 def parse_args(argv):
     if "COLUMNS" not in os.environ:
         os.environ["COLUMNS"] = "100"
@@ -201,11 +290,55 @@ def parse_args(argv):
         action="store_true",
         help="live-stream workflow log to standard error (implies --wait)",
     )
+    parser.add_argument(
+        "--live-tail",
+        action="store_true",
+        help="stream the followed log through a CloudWatch Logs Live Tail session instead of"
+        " polling it (implies --follow; Live Tail is billed per session-minute)",
+    )
+    parser.add_argument(
+        "--attach",
+        metavar="JOB_ID[,JOB_ID...]",
+        help="instead of submitting, wait for previously-submitted workflow job(s) to complete"
+        " (with --follow, live-stream their logs); - to read whitespace-separated job IDs from"
+        " standard input",
+    )
+    parser.add_argument(
+        "--notify",
+        metavar="SNS_TOPIC_ARN",
+        help="publish AWS Batch job state change event to SNS topic when the workflow job completes"
+        " (through an EventBridge rule; topic policy must allow events.amazonaws.com to publish)",
+    )
+    parser.add_argument(
+        "--runner-queue",
+        metavar="SQS_QUEUE_URL",
+        help="instead of submitting a workflow job, enqueue the run for a persistent"
+        " miniwdl-aws-workflow-runner service consuming this SQS queue (incompatible with --wait,"
+        " --follow, --notify) [env MINIWDL__AWS__RUNNER_QUEUE, ignored with those options]",
+    )
     parser.add_argument("--self-test", action="store_true", help="perform `miniwdl run_self_test`")
 
     args, unused_args = parser.parse_known_args(argv[1:])
+    args.follow = args.follow or args.live_tail
+    if args.attach:
+        job_ids = sys.stdin.read().split() if args.attach == "-" else args.attach.split(",")
+        args.attach = [job_id for job_id in job_ids if job_id]
+        if not args.attach:
+            print("--attach: no job IDs given", file=sys.stderr)
+            sys.exit(1)
+
+    if args.runner_queue:
+        if args.wait or args.follow or args.notify or args.attach:
+            print(
+                "--runner-queue is incompatible with --wait, --follow, --notify, --attach",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+    elif not (args.wait or args.follow or args.notify or args.attach):
+        # the environment default only applies where it could (so it needn't be unset to wait)
+        args.runner_queue = os.environ.get("MINIWDL__AWS__RUNNER_QUEUE", None)
 
-    if os.environ.get("MINIWDL__AWS__FS", "").strip().lower() in ("false", "f", "0", "no", "n"):
+    if os.environ.get("MINIWDL__AWS__FS", "").strip().lower() in _FALSE_STRINGS:
         args.efs = False
     if not args.mount:
         args.mount = "/mnt/efs" if args.efs else "/mnt/net"
@@ -237,7 +370,6 @@ def detect_env_args(args):
             file=sys.stderr,
         )
         sys.exit(1)
-    args.fsap = args.fsap if args.fsap else os.environ.get("MINIWDL__AWS__FSAP", "")
     args.task_queue = (
         args.task_queue if args.task_queue else os.environ.get("MINIWDL__AWS__TASK_QUEUE", None)
     )
@@ -283,10 +415,18 @@ def detect_tags_args(aws_batch, args):
     queue to detect default task job queue and (if applicable) EFS Access Point ID and workflow
     role ARN. Infra provisioning (CloudFormation, Terraform, etc.) may have set the expected tags.
     """
-    if not args.task_queue or (args.efs and not (args.fsap or args.workflow_role)):
-        workflow_queue_tags = aws_batch.describe_job_queues(jobQueues=[args.workflow_queue])[
-            "jobQueues"
-        ][0]["tags"]
+    if not args.task_queue or (args.efs and not (args.fsap and args.workflow_role)):
+        workflow_queues = aws_batch.describe_job_queues(jobQueues=[args.workflow_queue]).get(
+            "jobQueues", []
+        )
+        if not workflow_queues:
+            print(
+                f"Workflow job queue {args.workflow_queue} not found; double-check --workflow-queue"
+                " or environment variable MINIWDL__AWS__WORKFLOW_QUEUE.",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        workflow_queue_tags = workflow_queues[0].get("tags", {})
         if not args.task_queue:
             args.task_queue = workflow_queue_tags.get("DefaultTaskQueue", None)
             if not args.task_queue:
@@ -314,9 +454,7 @@ def detect_tags_args(aws_batch, args):
             # Workflow role ARN is needed for Fargate Batch (unlike EC2 Batch, where a role is
             # associated with the EC2 instance profile in the compute environment).
             try:
-                args.workflow_role = aws_batch.describe_job_queues(jobQueues=[args.workflow_queue])[
-                    "jobQueues"
-                ][0]["tags"]["WorkflowEngineRoleArn"]
+                args.workflow_role = workflow_queue_tags["WorkflowEngineRoleArn"]
                 assert args.workflow_role.startswith("arn:aws:iam::")
             except:
                 if not args.workflow_role:
@@ -354,12 +492,7 @@ def form_miniwdl_run_cmd(args, unused_args, verbose=False):
         job_name = args.name
         if not job_name:
             job_name = os.path.basename(wdl_filename).lstrip(".")
-            try:
-                for punct in (".", "?"):
-                    if job_name.index(punct) > 0:
-                        job_name = job_name[: job_name.index(punct)]
-            except ValueError:
-                pass
+            job_name = _JOB_NAME_STEM_END.split(job_name, maxsplit=1)[0] or job_name
             job_name = ("miniwdl_run_" + job_name)[:128]
         # pass most arguments through to miniwdl-run-s3upload inside workflow job
         miniwdl_run_cmd = ["miniwdl-run-s3upload"] + unused_args
@@ -429,45 +562,31 @@ def zip_wdl(wdl_filename, mount, verbose=False):
 
 
 def form_workflow_container_props(args, miniwdl_run_cmd, fs_id, wdl_zip=None, verbose=False):
-    environment = [
-        {"name": "MINIWDL__AWS__TASK_QUEUE", "value": args.task_queue},
-        {"name": "MINIWDL__FILE_IO__ROOT", "value": args.mount},
-    ]
+    env = {
+        "MINIWDL__AWS__TASK_QUEUE": args.task_queue,
+        "MINIWDL__FILE_IO__ROOT": args.mount,
+    }
     if args.task_queue_fallback:
-        environment.append(
-            {"name": "MINIWDL__AWS__TASK_QUEUE_FALLBACK", "value": args.task_queue_fallback}
-        )
+        env["MINIWDL__AWS__TASK_QUEUE_FALLBACK"] = args.task_queue_fallback
     if args.efs:
-        environment.append({"name": "MINIWDL__AWS__FS", "value": fs_id})
-        environment.append({"name": "MINIWDL__AWS__FSAP", "value": args.fsap})
+        env["MINIWDL__AWS__FS"] = fs_id
+        env["MINIWDL__AWS__FSAP"] = args.fsap
     else:
-        environment.append(
-            {"name": "MINIWDL__SCHEDULER__CONTAINER_BACKEND", "value": "aws_batch_job_no_efs"}
-        )
-    extra_env = set()
+        env["MINIWDL__SCHEDULER__CONTAINER_BACKEND"] = "aws_batch_job_no_efs"
+    extra_env = {}
     if not args.no_env:
         # pass through environment variables starting with MINIWDL__ (except those specific to
         # workflow job launch, or passed through via command line)
-        for k in os.environ:
-            if k.startswith("MINIWDL__") and k not in (
-                "MINIWDL__AWS__FS",
-                "MINIWDL__AWS__FSAP",
-                "MINIWDL__AWS__TASK_QUEUE",
-                "MINIWDL__AWS__TASK_QUEUE_FALLBACK",
-                "MINIWDL__AWS__WORKFLOW_QUEUE",
-                "MINIWDL__AWS__WORKFLOW_ROLE",
-                "MINIWDL__AWS__WORKFLOW_IMAGE",
-                "MINIWDL__AWS__S3_UPLOAD_FOLDER",
-                "MINIWDL__AWS__S3_UPLOAD_DELETE_AFTER",
-                "MINIWDL__FILE_IO__ROOT",
-            ):
-                environment.append({"name": k, "value": os.environ[k]})
-                extra_env.add(k)
+        extra_env = {
+            k: v
+            for k, v in os.environ.items()
+            if k.startswith("MINIWDL__") and k not in _NO_PASS_THROUGH_ENV
+        }
 
     if verbose and extra_env:
         print(
             "Passing through environment variables (--no-env to disable): "
-            + " ".join(list(extra_env)),
+            + " ".join(extra_env.keys()),
             file=sys.stderr,
         )
 
@@ -477,7 +596,9 @@ def form_workflow_container_props(args, miniwdl_run_cmd, fs_id, wdl_zip=None, ve
             {"type": "VCPU", "value": str(args.cpu)},
             {"type": "MEMORY", "value": str(args.memory_GiB * 1024)},
         ],
-        "environment": [],
+        # settings specific to the infrastructure are part of the (reusable) job definition, while
+        # the passed-through environment is set through overrides
+        "environment": [{"name": k, "value": v} for k, v in env.items()],
     }
     job_def_tags = {}
     job_tags = {}
@@ -510,7 +631,7 @@ def form_workflow_container_props(args, miniwdl_run_cmd, fs_id, wdl_zip=None, ve
             tag_num += 1
     workflow_container_overrides = {
         "command": miniwdl_run_cmd,
-        "environment": environment,
+        "environment": [{"name": k, "value": v} for k, v in extra_env.items()],
     }
     if args.efs:
         # EFS: set EFS volume/mountPoint and Fargate execution role
@@ -552,121 +673,513 @@ def form_workflow_container_props(args, miniwdl_run_cmd, fs_id, wdl_zip=None, ve
     return (workflow_container_props, workflow_container_overrides, job_def_tags, job_tags)
 
 
-def wait(aws_region_name, aws_batch, workflow_job_id, follow, expect_log_eof=True):
+def register_workflow_job_def(
+    aws_batch, args, job_name, workflow_container_props, job_def_tags, wdl_zip=None, verbose=False
+):
     """
-    Wait for workflow job to complete & return its exit code; optionally tail its log to stderr
+    Get a job definition for the workflow job, returning its name:revision handle and whether it's
+    transient (to be deregistered after submission).
+
+    The definition's name is derived from a digest of its properties, so that an existing active
+    definition can be reused across submissions (the run-specific command & environment are set
+    through container overrides). A definition carrying a shipped WDL zip is specific to one run,
+    so it's registered under the job name and transient; as is any definition if we can't look up
+    existing ones (lacking permission for batch:DescribeJobDefinitions).
     """
+    platform_capabilities = ["FARGATE" if args.efs else "EC2"]
+    transient = bool(wdl_zip)
+    if transient:
+        job_def_name = job_name
+    else:
+        digest = hashlib.sha256(
+            json.dumps(
+                {
+                    "platformCapabilities": platform_capabilities,
+                    "containerProperties": workflow_container_props,
+                },
+                sort_keys=True,
+            ).encode()
+        ).hexdigest()
+        job_def_name = "miniwdl-aws-workflow-" + digest[:16]
+        try:
+            existing = aws_batch.describe_job_definitions(
+                jobDefinitionName=job_def_name, status="ACTIVE"
+            ).get("jobDefinitions", [])
+        except aws_batch.exceptions.ClientError as exn:
+            # e.g. role lacks batch:DescribeJobDefinitions; register a transient one as before
+            if verbose:
+                print(f"Failed to look up reusable job definition: {exn}", file=sys.stderr)
+            existing = []
+            transient = True
+            job_def_name = job_name
+        if existing:
+            revision = max(job_def["revision"] for job_def in existing)
+            if verbose:
+                print(f"Workflow job definition: {job_def_name}:{revision}", file=sys.stderr)
+            return (f"{job_def_name}:{revision}", False)
+
     try:
-        log_follower = None
-        exit_code = None
-        saw_end = False
-        while exit_code is None:
-            time.sleep(1.0)
-            job_descs = aws_batch.describe_jobs(jobs=[workflow_job_id])
-            job_desc = job_descs["jobs"][0]
-            if (
-                not log_follower
-                and "container" in job_desc
-                and "logStreamName" in job_desc["container"]
-            ):
-                log_stream_name = job_desc["container"]["logStreamName"]
-                print("Log stream: " + log_stream_name, file=sys.stderr)
-                sys.stderr.flush()
-                log_follower = CloudWatchLogsFollower(
-                    boto3.DEFAULT_SESSION, aws_region_name, "/aws/batch/job", log_stream_name
-                )
-            if follow and log_follower:
-                for event in log_follower.new_events():
-                    if END_OF_LOG not in event["message"]:
-                        print(event["message"], file=sys.stderr)
-                    else:
-                        saw_end = True
-                sys.stderr.flush()
-            if job_desc["status"] == "SUCCEEDED":
-                exit_code = 0
-            elif job_desc["status"] == "FAILED":
-                exit_code = -1
-                if "container" in job_desc and "exitCode" in job_desc["container"]:
-                    exit_code = job_desc["container"]["exitCode"]
-                    assert exit_code != 0
-        if expect_log_eof and follow and log_follower and not saw_end:
-            # give straggler log messages a few seconds to appear
-            time.sleep(3.0)
-            for event in log_follower.new_events():
-                if END_OF_LOG not in event["message"]:
-                    print(event["message"], file=sys.stderr)
-                else:
-                    saw_end = True
-            if not saw_end:
-                print(
-                    f"[miniwdl-aws-submit] WARNING: end-of-log marker not seen; more information may appear in log stream {log_stream_name}",
-                    file=sys.stderr,
+        workflow_job_def = aws_batch.register_job_definition(
+            jobDefinitionName=job_def_name,
+            platformCapabilities=platform_capabilities,
+            type="container",
+            containerProperties=workflow_container_props,
+            tags=job_def_tags,
+        )
+    except BaseException as exc:
+        if wdl_zip and "JobDefinition size must be less than" in str(exc):
+            print(_WDL_ZIP_SIZE_MSG, file=sys.stderr)
+            sys.exit(123)
+        raise
+    handle = f"{workflow_job_def['jobDefinitionName']}:{workflow_job_def['revision']}"
+    if verbose and not transient:
+        print(f"Workflow job definition: {handle} (registered for reuse)", file=sys.stderr)
+    return (handle, transient)
+
+
+def enqueue_workflow_run(
+    aws_sqs,
+    queue_url,
+    workflow_container_props,
+    workflow_container_overrides,
+    wdl_zip,
+    verbose,
+):
+    """
+    Send the workflow run (command & environment) to the SQS queue consumed by a persistent
+    miniwdl-aws-workflow-runner service, instead of submitting a workflow job. A shipped WDL zip
+    goes whole in the WDL_ZIP environment variable, since the runner has no job/job definition tags
+    from which to load any spillover.
+    """
+    env = {
+        item["name"]: item["value"]
+        for item in workflow_container_props["environment"]
+        + workflow_container_overrides["environment"]
+    }
+    if wdl_zip:
+        env["WDL_ZIP"] = wdl_zip
+    message_body = json.dumps(
+        {"command": workflow_container_overrides["command"], "environment": env},
+        separators=(",", ":"),
+    )
+    if len(message_body.encode()) > _SQS_MESSAGE_MAX:
+        print(
+            "\nExceeded SQS message size limit; make the WDL source code and/or inputs available by"
+            " URL or remote filesystem path, to pass by reference.",
+            file=sys.stderr,
+        )
+        return 123
+    message_id = aws_sqs.send_message(QueueUrl=queue_url, MessageBody=message_body)["MessageId"]
+    if verbose:
+        print(f"Enqueued on {queue_url}:", file=sys.stderr)
+        sys.stderr.flush()
+    print(message_id)
+    return 0
+
+
+def notify_on_completion(aws_region_name, job_name, topic_arn):
+    """
+    Set up an EventBridge rule to publish the (to-be-submitted) workflow job's completion event to
+    an SNS topic, so that nothing needs to remain running to wait on it; returns the rule name
+    """
+    aws_events = aws_client("events", aws_region_name)
+    # rule names are limited to 64 characters; keep the job name's random suffix for uniqueness
+    rule_name = "miniwdl-aws-" + job_name[-52:]
+    aws_events.put_rule(
+        Name=rule_name,
+        EventPattern=json.dumps(
+            {
+                "source": ["aws.batch"],
+                "detail-type": ["Batch Job State Change"],
+                "detail": {"jobName": [job_name], "status": ["SUCCEEDED", "FAILED"]},
+            }
+        ),
+        Description="miniwdl-aws-submit --notify",
+    )
+    try:
+        aws_events.put_targets(Rule=rule_name, Targets=[{"Id": "sns", "Arn": topic_arn}])
+    except BaseException:
+        delete_notify_rule(aws_region_name, rule_name)
+        raise
+    print(
+        f"EventBridge rule {rule_name} will notify {topic_arn} upon workflow job completion. To delete"
+        " it afterwards:\n"
+        f"    aws events remove-targets --rule {rule_name} --ids sns"
+        f" && aws events delete-rule --name {rule_name}",
+        file=sys.stderr,
+    )
+    return rule_name
+
+
+def delete_notify_rule(aws_region_name, rule_name):
+    """
+    Delete the notify_on_completion() rule, when the workflow job wasn't submitted after all
+    """
+    aws_events = aws_client("events", aws_region_name)
+    try:
+        aws_events.remove_targets(Rule=rule_name, Ids=["sns"])
+        aws_events.delete_rule(Name=rule_name)
+    except aws_events.exceptions.ClientError as exn:
+        print(f"Failed to delete EventBridge rule {rule_name}: {exn}", file=sys.stderr)
+
+
+def wait(aws_batch, aws_logs, workflow_job_ids, follow, expect_log_eof=True, live_tail=False):
+    """
+    Wait for workflow job(s) to complete & return the exit code (the first nonzero one, if several
+    jobs); optionally tail their logs to stderr (each line prefixed with the job ID, if several),
+    through CloudWatch Logs Live Tail if live_tail
+    """
+    log_followers = {}
+    log_prefixes = {
+        job_id: (job_id + "\t" if len(workflow_job_ids) > 1 else "") for job_id in workflow_job_ids
+    }
+    # background thread for DescribeJobs, to overlap with fetching logs
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    try:
+        job_descs = {}
+        exit_codes = {}
+        saw_end = set()
+        # poll job status with exponential backoff (capped lower if we're live-streaming logs, and
+        # reset whenever a status changes), and each log as often as its follower suggests
+        poll_count = 0
+        describe_time = time.monotonic() + poll_delay(poll_count, 5.0 if follow else 30.0)
+        log_poll_times = {}  # job ID => when its log follower is next due to be polled
+        while len(exit_codes) < len(workflow_job_ids):
+            pending_job_ids = [job_id for job_id in workflow_job_ids if job_id not in exit_codes]
+            sleep_until = min(
+                [describe_time]
+                + [log_poll_times[job_id] for job_id in pending_job_ids if job_id in log_poll_times]
+            )
+            time.sleep(max(0.0, sleep_until - time.monotonic()))
+            describe_future = None
+            if not job_descs or time.monotonic() >= describe_time:
+                describe_future = pool.submit(describe_jobs_batch, aws_batch, pending_job_ids)
+            for job_id in pending_job_ids:
+                if job_id in log_poll_times and time.monotonic() >= log_poll_times[job_id]:
+                    if print_log_events(log_followers[job_id], log_prefixes[job_id]):
+                        saw_end.add(job_id)
+                    log_poll_times[job_id] = time.monotonic() + log_followers[job_id].poll_hint()
+            if describe_future:
+                prev_statuses = {job_id: job_descs[job_id]["status"] for job_id in job_descs}
+                job_descs.update(describe_future.result())
+                poll_count += 1
+                if any(
+                    job_descs[job_id]["status"] != prev_statuses.get(job_id)
+                    for job_id in pending_job_ids
+                ):
+                    # status changed, so the next change may come soon; reset backoff
+                    poll_count = 0
+                describe_time = time.monotonic() + poll_delay(poll_count, 5.0 if follow else 30.0)
+            for job_id in pending_job_ids:
+                job_desc = job_descs[job_id]
+                if (
+                    job_id not in log_followers
+                    and "container" in job_desc
+                    and "logStreamName" in job_desc["container"]
+                ):
+                    log_stream_name = job_desc["container"]["logStreamName"]
+                    print(log_prefixes[job_id] + "Log stream: " + log_stream_name, file=sys.stderr)
+                    sys.stderr.flush()
+                    log_followers[job_id] = (
+                        follow_log_stream if follow and live_tail else CloudWatchLogsFollower
+                    )(aws_logs, "/aws/batch/job", log_stream_name)
+                    if follow:
+                        if print_log_events(log_followers[job_id], log_prefixes[job_id]):
+                            saw_end.add(job_id)
+                        log_poll_times[job_id] = (
+                            time.monotonic() + log_followers[job_id].poll_hint()
+                        )
+                if job_desc["status"] == "SUCCEEDED":
+                    exit_codes[job_id] = 0
+                elif job_desc["status"] == "FAILED":
+                    exit_codes[job_id] = -1
+                    if "container" in job_desc and "exitCode" in job_desc["container"]:
+                        exit_codes[job_id] = job_desc["container"]["exitCode"]
+                        assert exit_codes[job_id] != 0
+        if expect_log_eof and follow:
+            # give straggler log messages up to a few seconds to appear
+            deadline = time.monotonic() + 3.0
+            while not saw_end.issuperset(log_followers.keys()) and time.monotonic() < deadline:
+                time.sleep(0.25)
+                for job_id, log_follower in log_followers.items():
+                    if job_id not in saw_end and print_log_events(
+                        log_follower, log_prefixes[job_id]
+                    ):
+                        saw_end.add(job_id)
+            for job_id, log_follower in log_followers.items():
+                if job_id not in saw_end:
+                    print(
+                        f"[miniwdl-aws-submit] WARNING: end-of-log marker not seen; more information may appear in log stream {log_follower.stream_name}",
+                        file=sys.stderr,
+                    )
+                    sys.stderr.flush()
+        exit_code = 0
+        for job_id in workflow_job_ids:
+            job_desc = job_descs[job_id]
+            status = job_desc["status"]
+            reason = job_desc.get("statusReason", "")
+            if reason:
+                reason = (
+                    f"\t{reason}"
+                    if reason and reason != "Essential container in task exited"
+                    else ""
                 )
-            sys.stderr.flush()
-        status = job_desc["status"]
-        reason = job_desc.get("statusReason", "")
-        if reason:
-            reason = (
-                f"\t{reason}" if reason and reason != "Essential container in task exited" else ""
+            print(status + "\t" + job_id + reason, file=sys.stderr)
+            if status == "FAILED" and "Container Overrides length must be at most" in reason:
+                print(_WDL_ZIP_SIZE_MSG, file=sys.stderr)
+                exit_codes[job_id] = 123
+            assert isinstance(exit_codes[job_id], int) and (
+                exit_codes[job_id] != 0 or status == "SUCCEEDED"
             )
-        print(status + "\t" + workflow_job_id + reason, file=sys.stderr)
-        if status == "FAILED" and "Container Overrides length must be at most" in reason:
-            print(_WDL_ZIP_SIZE_MSG, file=sys.stderr)
-            exit_code = 123
-        assert isinstance(exit_code, int) and (exit_code != 0 or status == "SUCCEEDED")
+            exit_code = exit_code or exit_codes[job_id]
         return exit_code
     except KeyboardInterrupt:
         print(
-            "[miniwdl-aws-submit] interrupted by Ctrl-C; workflow job probably remains active. To terminate:\n"
-            f"                     aws batch terminate-job --reason abort --job-id {workflow_job_id}",
+            "[miniwdl-aws-submit] interrupted by Ctrl-C; workflow job probably remains active. To terminate:",
             file=sys.stderr,
         )
+        for job_id in workflow_job_ids:
+            print(
+                f"                     aws batch terminate-job --reason abort --job-id {job_id}",
+                file=sys.stderr,
+            )
         return -1
+    finally:
+        pool.shutdown(wait=False)
+        for log_follower in log_followers.values():
+            log_follower.close()
+
+
+def describe_jobs_batch(aws_batch, job_ids):
+    """
+    Describe the Batch jobs (in as few DescribeJobs requests as possible), returning a dict from job
+    ID to description
+    """
+    job_descs = {}
+    for i in range(0, len(job_ids), _DESCRIBE_JOBS_MAX):
+        for job_desc in aws_batch.describe_jobs(jobs=job_ids[i : i + _DESCRIBE_JOBS_MAX])["jobs"]:
+            job_descs[job_desc["jobId"]] = job_desc
+    missing = [job_id for job_id in job_ids if job_id not in job_descs]
+    if missing:
+        print("AWS Batch job(s) not found: " + " ".join(missing), file=sys.stderr)
+        sys.exit(1)
+    return job_descs
+
+
+def poll_delay(poll_count, cap):
+    """
+    Seconds to sleep before the next status poll: exponential backoff (x1.5) from one second up to
+    cap, with jitter to spread out concurrent submitters' requests
+    """
+    return min(cap, 1.5 ** min(poll_count, 16)) * random.uniform(0.5, 1.0)
+
+
+def print_log_events(log_follower, prefix=""):
+    """
+    Write the follower's new log messages to stderr (in one write), and return True if the
+    end-of-log marker was among them
+    """
+    saw_end = False
+    buf = []
+    for event in log_follower.new_events():
+        if END_OF_LOG not in event["message"]:
+            buf.append(prefix)
+            buf.append(event["message"])
+            buf.append("\n")
+        else:
+            saw_end = True
+    if buf:
+        sys.stderr.write("".join(buf))
+        sys.stderr.flush()
+    return saw_end
 
 
 class CloudWatchLogsFollower:
-    # Based loosely on:
-    #   https://github.com/aws/aws-cli/blob/v2/awscli/customizations/logs/tail.py
-    # which wasn't suitable to use directly at the time of this writing, because of
-    #   https://github.com/aws/aws-cli/issues/5560
-    def __init__(self, boto_session, region_name, group_name, stream_name=None):
+    """
+    Polls a CloudWatch Logs stream for new events, following the GetLogEvents forward token so
+    that each poll only reads events appended since the last one.
+    """
+
+    def __init__(self, aws_logs, group_name, stream_name):
         self.group_name = group_name
         self.stream_name = stream_name
         self._newest_timestamp = None
-        self._newest_event_ids = set()
-        self._client = boto_session.client("logs", region_name=region_name)
+        self._next_token = None
+        self._client = aws_logs
+        self._idle_sleep = 1.0
 
-    def new_events(self):
-        event_ids_per_timestamp = defaultdict(set)
+    def close(self):
+        pass
 
-        filter_args = {"logGroupName": self.group_name}
-        if self.stream_name:
-            filter_args["logStreamNames"] = [self.stream_name]
-        if self._newest_timestamp:
-            filter_args["startTime"] = self._newest_timestamp
+    def poll_hint(self):
+        """
+        Suggested seconds to wait before calling new_events() again: one second while events are
+        flowing, backing off up to 15 seconds while the log is quiet
+        """
+        return self._idle_sleep
+
+    def new_events(self):
+        any_events = False
+        get_args = {
+            "logGroupName": self.group_name,
+            "logStreamName": self.stream_name,
+            "startFromHead": True,
+        }
         while True:
+            if self._next_token:
+                get_args["nextToken"] = self._next_token
+            elif self._newest_timestamp:
+                get_args["startTime"] = self._newest_timestamp
             try:
-                response = self._client.filter_log_events(**filter_args)
+                response = self._client.get_log_events(**get_args)
             except self._client.exceptions.ResourceNotFoundException:
-                return  # we may learn the Batch job's log stream name before it actually exists
+                break  # we may learn the Batch job's log stream name before it actually exists
             for event in response["events"]:
-                # For the case where we've hit the last page, we will be
-                # reusing the newest timestamp of the received events to keep polling.
-                # This means it is possible that duplicate log events with same timestamp
-                # are returned back which we do not want to yield again.
-                # We only want to yield log events that we have not seen.
-                if event["eventId"] not in self._newest_event_ids:
-                    event_ids_per_timestamp[event["timestamp"]].add(event["eventId"])
-                    yield event
-            if "nextToken" in response:
-                filter_args["nextToken"] = response["nextToken"]
-            else:
+                yield event
+                any_events = True
+                self._newest_timestamp = max(self._newest_timestamp or 0, event["timestamp"])
+            # the forward token stays the same once we've reached the end of the stream
+            if response["nextForwardToken"] == self._next_token:
                 break
+            self._next_token = response["nextForwardToken"]
+        self._idle_sleep = 1.0 if any_events else min(2.0 * self._idle_sleep, 15.0)
+
+
+def follow_log_stream(aws_logs, group_name, stream_name):
+    """
+    Open a CloudWatchLogsLiveTail on the log stream if possible, otherwise a CloudWatchLogsFollower
+    """
+    try:
+        return CloudWatchLogsLiveTail(aws_logs, group_name, stream_name)
+    except Exception:
+        # e.g. AccessDeniedException, or a botocore version predating StartLiveTail
+        return CloudWatchLogsFollower(aws_logs, group_name, stream_name)
+
+
+class CloudWatchLogsLiveTail(CloudWatchLogsFollower):
+    """
+    Follows the log stream through a CloudWatch Logs Live Tail session, which pushes new events to
+    a background thread instead of our polling GetLogEvents for them. Live Tail only delivers
+    events ingested after the session starts, so the base class polling is used to catch up on
+    earlier events, and to continue after the session ends (they time out after three hours).
+    Live Tail is billed per session-minute, unlike polling.
+    """
+
+    def __init__(self, aws_logs, group_name, stream_name):
+        super().__init__(aws_logs, group_name, stream_name)
+        # StartLiveTail takes the log group ARN, without the :* suffix DescribeLogGroups reports
+        group_arn = next(
+            group["arn"]
+            for group in self._client.describe_log_groups(logGroupNamePrefix=group_name)[
+                "logGroups"
+            ]
+            if group["logGroupName"] == group_name
+        )
+        if group_arn.endswith(":*"):
+            group_arn = group_arn[:-2]
+        self._stream = self._client.start_live_tail(
+            logGroupIdentifiers=[group_arn], logStreamNames=[stream_name]
+        )["responseStream"]
+        self._live_events = queue.Queue()
+        self._live = True
+        self._catching_up = True
+        # Events ingested while the session was starting may be both polled and pushed, and those
+        # at the newest timestamp when the session ends are polled again (from that timestamp).
+        # Lacking event IDs, we count such (timestamp, message) occurrences already yielded by one
+        # source, to skip as many of them from the other; repeated log lines are otherwise kept.
+        self._overlap = collections.Counter()
+        self._newest_yielded = 0
+        self._yielded_at_newest = collections.Counter()
+        threading.Thread(target=self._receive, daemon=True).start()
+
+    def _receive(self):
+        try:
+            for update in self._stream:
+                for event in update.get("sessionUpdate", {}).get("sessionResults", []):
+                    self._live_events.put(event)
+        except Exception:
+            pass  # session timed out, or stream closed
+        self._live_events.put(None)
+
+    def close(self):
+        self._stream.close()
+
+    def poll_hint(self):
+        # draining pushed events is free, so check every second while the session lasts
+        return 1.0 if self._live else super().poll_hint()
+
+    def new_events(self):
+        if self._catching_up:
+            caught_up = list(self._yield_new(super().new_events()))
+            yield from caught_up
+            # live events up to a minute older than the newest polled may repeat polled ones
+            self._overlap = collections.Counter(
+                (event["timestamp"], event["message"])
+                for event in caught_up
+                if event["timestamp"] >= self._newest_yielded - 60000
+            )
+            self._catching_up = False
+        if self._live:
+            live_events = []
+            while True:
+                try:
+                    event = self._live_events.get_nowait()
+                except queue.Empty:
+                    break
+                if event is None:
+                    self._live = False
+                    break
+                live_events.append(event)
+            yield from self._yield_new(live_events)
+            if not self._live:
+                # session ended; resume polling from the newest timestamp yielded, which will
+                # repeat the events we've already yielded at that timestamp
+                self._overlap = collections.Counter(self._yielded_at_newest)
+                self._newest_timestamp = self._newest_yielded or None
+                self._next_token = None
+        if not self._live:
+            yield from self._yield_new(super().new_events())
+
+    def _yield_new(self, events):
+        for event in events:
+            key = (event["timestamp"], event["message"])
+            if self._overlap[key] > 0:
+                self._overlap[key] -= 1
+                continue
+            if event["timestamp"] > self._newest_yielded:
+                self._newest_yielded = event["timestamp"]
+                self._yielded_at_newest.clear()
+            if event["timestamp"] == self._newest_yielded:
+                self._yielded_at_newest[key] += 1
+            yield event
+
+
+_DESCRIBE_JOBS_MAX = 100  # maximum jobs per DescribeJobs request
+
+_SQS_MESSAGE_MAX = 262144  # maximum SQS message size (bytes)
+
+# MINIWDL__* environment variables excluded from pass-through to the workflow job
+_NO_PASS_THROUGH_ENV = frozenset(
+    (
+        "MINIWDL__AWS__FS",
+        "MINIWDL__AWS__FSAP",
+        "MINIWDL__AWS__TASK_QUEUE",
+        "MINIWDL__AWS__TASK_QUEUE_FALLBACK",
+        "MINIWDL__AWS__WORKFLOW_QUEUE",
+        "MINIWDL__AWS__WORKFLOW_ROLE",
+        "MINIWDL__AWS__WORKFLOW_IMAGE",
+        "MINIWDL__AWS__S3_UPLOAD_FOLDER",
+        "MINIWDL__AWS__S3_UPLOAD_DELETE_AFTER",
+        "MINIWDL__AWS__RUNNER_QUEUE",
+        "MINIWDL__FILE_IO__ROOT",
+    )
+)
 
-        if event_ids_per_timestamp:
-            self._newest_timestamp = max(event_ids_per_timestamp.keys())
-            self._newest_event_ids = event_ids_per_timestamp[self._newest_timestamp]
+# environment variable values read as boolean false (e.g. MINIWDL__AWS__FS=false for --no-efs)
+_FALSE_STRINGS = frozenset(("false", "f", "0", "no", "n"))
 
+# job name is derived from the WDL filename up to its extension (or URL query string)
+_JOB_NAME_STEM_END = re.compile(r"[.?]")
 
 _WDL_ZIP_SIZE_MSG = (
     "\nExceeded AWS Batch request payload size limit; make the WDL source code and/or inputs"
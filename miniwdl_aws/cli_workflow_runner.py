@@ -0,0 +1,166 @@
+"""
+miniwdl-aws-workflow-runner CLI entry point (console script) for a long-running "workflow runner"
+service, consuming workflow runs enqueued by `miniwdl-aws-submit --runner-queue` on an SQS queue.
+Each run is executed as a subprocess (normally miniwdl-run-s3upload) in this container, which thus
+avoids the startup latency of launching a new Batch workflow job per run. The container should be
+set up like a workflow job: miniwdl-aws docker image, IAM role, and EFS mounted at /mnt/efs.
+"""
+
+import sys
+import os
+import json
+import time
+import signal
+import shlex
+import argparse
+import subprocess
+import botocore.exceptions
+from ._util import detect_aws_region
+from .cli_submit import aws_client
+
+
+def miniwdl_aws_workflow_runner():
+    parser = argparse.ArgumentParser(
+        prog="miniwdl-aws-workflow-runner",
+        description="Run workflows enqueued on an SQS queue by `miniwdl-aws-submit --runner-queue`",
+    )
+    parser.add_argument(
+        "--queue-url",
+        help="SQS queue URL from which to consume workflow runs [env MINIWDL__AWS__RUNNER_QUEUE]",
+    )
+    parser.add_argument(
+        "--max-runs", metavar="N", type=int, default=4, help="maximum concurrent workflow runs"
+    )
+    args = parser.parse_args()
+    if args.max_runs < 1:
+        parser.error("--max-runs must be at least 1")
+    args.queue_url = args.queue_url or os.environ.get("MINIWDL__AWS__RUNNER_QUEUE", None)
+    if not args.queue_url:
+        print(
+            "--queue-url is required (or environment variable MINIWDL__AWS__RUNNER_QUEUE)",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    aws_sqs = aws_client("sqs", detect_aws_region(None))
+
+    # on SIGTERM (e.g. service scale-in) or SIGINT, stop consuming & pass the signal on to running
+    # workflows, so that miniwdl terminates their task jobs on the way out
+    stopping = []
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda sig, _: stopping.append(sig))
+
+    runs = {}  # message ID => Popen
+    error_count = 0
+    try:
+        while not stopping:
+            for message_id, proc in list(runs.items()):
+                if proc.poll() is not None:
+                    print(f"Finished {message_id} (exit status {proc.returncode})", file=sys.stderr)
+                    del runs[message_id]
+            if len(runs) >= args.max_runs:
+                time.sleep(1.0)
+                continue
+            # long poll for more runs, up to our remaining capacity
+            try:
+                messages = aws_sqs.receive_message(
+                    QueueUrl=args.queue_url,
+                    MaxNumberOfMessages=min(args.max_runs - len(runs), 10),
+                    WaitTimeSeconds=20,
+                ).get("Messages", [])
+            except (botocore.exceptions.ClientError, botocore.exceptions.BotoCoreError) as exn:
+                # keep the running workflows going through transient SQS/network/credential
+                # errors, backing off until they clear
+                error_count += 1
+                print(f"Failed to receive from {args.queue_url}: {exn}", file=sys.stderr)
+                time.sleep(min(2.0**error_count, 60.0))
+                continue
+            error_count = 0
+            for i, message in enumerate(messages):
+                if stopping:
+                    # the signal arrived during (or since) the long poll, which it doesn't
+                    # interrupt; leave the remaining runs for another runner
+                    release_messages(aws_sqs, args.queue_url, messages[i:])
+                    break
+                # delete the message before starting the run: workflows usually outlast the
+                # queue's visibility timeout, and we'd rather not run one twice
+                try:
+                    aws_sqs.delete_message(
+                        QueueUrl=args.queue_url, ReceiptHandle=message["ReceiptHandle"]
+                    )
+                except (
+                    botocore.exceptions.ClientError,
+                    botocore.exceptions.BotoCoreError,
+                ) as exn:
+                    # leave it to reappear on the queue after the visibility timeout
+                    print(f"Failed to delete {message['MessageId']}: {exn}", file=sys.stderr)
+                    continue
+                try:
+                    body = json.loads(message["Body"])
+                    command, environment = check_run(body)
+                    env = dict(os.environ)
+                    env.update(environment)
+                    runs[message["MessageId"]] = subprocess.Popen(command, env=env)
+                except Exception as exn:
+                    print(f"Failed to start {message['MessageId']}: {exn}", file=sys.stderr)
+                    continue
+                print(
+                    f"Started {message['MessageId']}: " + shlex.join(body["command"]),
+                    file=sys.stderr,
+                )
+    finally:
+        finish_runs(runs, stopping)
+
+
+def release_messages(aws_sqs, queue_url, messages):
+    """
+    Make received messages visible on the queue again right away (instead of after the visibility
+    timeout), for another runner to receive
+    """
+    for message in messages:
+        try:
+            aws_sqs.change_message_visibility(
+                QueueUrl=queue_url, ReceiptHandle=message["ReceiptHandle"], VisibilityTimeout=0
+            )
+        except (botocore.exceptions.ClientError, botocore.exceptions.BotoCoreError) as exn:
+            # it'll reappear after the visibility timeout anyway
+            print(f"Failed to release {message['MessageId']}: {exn}", file=sys.stderr)
+
+
+def finish_runs(runs, stopping):
+    """
+    Wait for the running workflows to exit, passing on the stop signal to them once one's received
+    (but otherwise letting them finish, if we're exiting on some unexpected error)
+    """
+    signalled = False
+    while any(proc.poll() is None for proc in runs.values()):
+        if stopping and not signalled:
+            for proc in runs.values():
+                if proc.poll() is None:
+                    proc.send_signal(stopping[0])
+            signalled = True
+        time.sleep(1.0)
+
+
+def check_run(body):
+    """
+    Validate an enqueued run's command & environment, returning them. Whoever can send to the queue
+    gets to run workflows under this service's IAM role, but not arbitrary commands: only
+    miniwdl-run-s3upload or `miniwdl run_self_test`, with MINIWDL__* (and WDL_ZIP) environment.
+    """
+    command = body["command"]
+    environment = body.get("environment", {})
+    if not (
+        isinstance(command, list)
+        and all(isinstance(arg, str) for arg in command)
+        and (command[:1] == ["miniwdl-run-s3upload"] or command[:2] == ["miniwdl", "run_self_test"])
+    ):
+        raise ValueError("unexpected command: " + json.dumps(command))
+    if not (
+        isinstance(environment, dict)
+        and all(
+            (name.startswith("MINIWDL__") or name == "WDL_ZIP") and isinstance(value, str)
+            for name, value in environment.items()
+        )
+    ):
+        raise ValueError("unexpected environment: " + " ".join(map(str, environment)))
+    return (command, environment)
@@ -11,10 +11,10 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     author="Wid L. Hacker",
-    python_requires=">=3.6",
+    python_requires=">=3.8",
     packages=find_packages(),
     setup_requires=["reentry"],
-    install_requires=["miniwdl>=1.11.1", "boto3>=1.17", "requests"],
+    install_requires=["miniwdl>=1.11.1", "boto3>=1.26", "requests"],
     reentry_register=True,
     entry_points={
         "miniwdl.plugin.container_backend": [
@@ -24,6 +24,7 @@ setup(
         "console_scripts": [
             "miniwdl-run-s3upload = miniwdl_aws:miniwdl_run_s3upload",
             "miniwdl-aws-submit = miniwdl_aws.__main__:main",
+            "miniwdl-aws-workflow-runner = miniwdl_aws:miniwdl_aws_workflow_runner",
         ],
     },
 )
@@ -0,0 +1,34 @@
+"""
+Fixtures for the live tests in test.py, which submit workflows to AWS Batch through
+miniwdl-aws-submit (plain helper functions are in helpers.py)
+"""
+
+import os
+import pytest
+import boto3
+from datetime import datetime
+
+
+@pytest.fixture(scope="session")
+def warm_boto3():
+    """
+    Resolve AWS credentials once up front (failing fast if they're missing), to be reused by all
+    the clients created from boto3's default session
+    """
+    boto3.client("sts", region_name=os.environ["AWS_DEFAULT_REGION"]).get_caller_identity()
+
+
+@pytest.fixture(scope="module")
+def aws_batch(warm_boto3):
+    return boto3.client("batch", region_name=os.environ["AWS_DEFAULT_REGION"])
+
+
+@pytest.fixture(scope="session")
+def test_s3_folder():
+    """
+    S3 folder for this test session (per pytest-xdist worker, if applicable)
+    """
+    folder = datetime.today().strftime("%Y%m%d_%H%M%S")
+    if "PYTEST_XDIST_WORKER" in os.environ:
+        folder += "_" + os.environ["PYTEST_XDIST_WORKER"]
+    return f"s3://{os.environ['MINIWDL_AWS_TEST_BUCKET']}/{folder}/"
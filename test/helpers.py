@@ -0,0 +1,121 @@
+"""
+Helpers for the live tests in test.py: running miniwdl-aws-submit, and reading/staging S3 objects
+"""
+
+import os
+import json
+import subprocess
+import boto3
+import botocore.config
+import botocore.exceptions
+import concurrent.futures
+import urllib.request
+
+assert "AWS_DEFAULT_REGION" in os.environ
+assert (
+    "MINIWDL__AWS__WORKFLOW_IMAGE" in os.environ
+    and "miniwdl-aws" in os.environ["MINIWDL__AWS__WORKFLOW_IMAGE"]
+), "set environment MINIWDL__AWS__WORKFLOW_IMAGE to repo:digest"
+assert (
+    "MINIWDL__AWS__WORKFLOW_QUEUE" in os.environ
+), "set MINIWDL__AWS__WORKFLOW_QUEUE to Batch queue name"
+assert (
+    "MINIWDL_AWS_TEST_BUCKET" in os.environ
+), "set MINIWDL_AWS_TEST_BUCKET to test S3 bucket (name only)"
+
+# shared by get_s3uri() calls (including concurrent ones), to reuse its loaded service model and
+# connection pool
+_s3 = boto3.client(
+    "s3",
+    region_name=os.environ["AWS_DEFAULT_REGION"],
+    config=botocore.config.Config(max_pool_connections=32),
+)
+
+
+def batch_miniwdl(aws_batch, args, env=None, upload=None, cache=False):
+    """
+    Submit & await a Batch job to run cmd in the miniwdl_aws container (usually ~miniwdl run~
+    to launch other Batch jobs in turn)
+    """
+    cmd = ["python3", "-m", "miniwdl_aws"]
+    cmd.extend(args)
+    cmd.append("--follow")
+    if not cache:
+        cmd.append("--no-cache")
+    if upload:
+        if not upload.endswith("/"):
+            upload += "/"
+        cmd.extend(["--s3upload", upload])
+
+    exit_code = subprocess.run(
+        cmd, cwd=os.path.dirname(os.path.dirname(__file__)), check=False, env=env
+    ).returncode
+
+    if exit_code != 0:
+        ans = {"success": False, "exit_code": exit_code}
+        if upload:
+            error = get_s3json(upload + "error.json")
+            if error is not None:
+                ans["error"] = error
+        return ans
+
+    ans = {"success": True}
+    if upload:
+        outputs = get_s3json(upload + "outputs.json")
+        if outputs is not None:
+            ans["outputs"] = outputs
+    return ans
+
+
+def get_s3uri(uri):
+    """
+    Download bytes from s3:// URI
+    """
+    body = get_s3body(uri)
+    return body.read() if body is not None else None
+
+
+def get_s3json(uri):
+    """
+    Download & parse JSON from s3:// URI
+    """
+    body = get_s3body(uri)
+    return json.load(body) if body is not None else None
+
+
+def get_s3body(uri):
+    """
+    Open the streaming body of the s3:// URI's object (None if it doesn't exist), in one GetObject
+    request (download_file() would add a HEAD request first, not worthwhile for these small files)
+    """
+    assert uri.startswith("s3://")
+    bucket, _, key = uri[5:].partition("/")
+    try:
+        return _s3.get_object(Bucket=bucket, Key=key)["Body"]
+    except _s3.exceptions.NoSuchKey:
+        return None
+
+
+def get_s3uris(uris, max_workers=16):
+    """
+    Download bytes from several s3:// URIs concurrently, returning a dict from URI to bytes
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return dict(zip(uris, pool.map(get_s3uri, uris)))
+
+
+def s3_staged(url):
+    """
+    Copy the file at the URL into the test bucket (once; it's kept across test sessions) and return
+    its s3:// URI, so that workflows needn't download it from the remote server on every run
+    """
+    bucket = os.environ["MINIWDL_AWS_TEST_BUCKET"]
+    key = "staged_inputs/" + url.split("://", 1)[1]
+    try:
+        _s3.head_object(Bucket=bucket, Key=key)
+    except botocore.exceptions.ClientError as exn:
+        if exn.response["Error"]["Code"] != "404":
+            raise
+        with urllib.request.urlopen(url) as response:
+            _s3.upload_fileobj(response, bucket, key)
+    return f"s3://{bucket}/{key}"
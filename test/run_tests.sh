@@ -18,4 +18,6 @@ aws s3api create-bucket --bucket "$MINIWDL_AWS_TEST_BUCKET" \
     || true
 # NOTE: workflow IAM role needs to be able to write to that bucket...
 
-pytest -sxv test*.py $@
+# Tests mostly await remote Batch jobs, so run several at once with pytest-xdist; set
+# MINIWDL_AWS_TEST_WORKERS=0 to run them serially with live log output.
+pytest -sxv -n "${MINIWDL_AWS_TEST_WORKERS:-8}" --dist loadgroup test*.py $@
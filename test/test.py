@@ -1,81 +1,11 @@
 import os
-import json
 import subprocess
 import time
 import pytest
-import boto3
 import random
-from datetime import datetime
-from urllib.parse import urlparse
-
-assert "AWS_DEFAULT_REGION" in os.environ
-assert (
-    "MINIWDL__AWS__WORKFLOW_IMAGE" in os.environ
-    and "miniwdl-aws" in os.environ["MINIWDL__AWS__WORKFLOW_IMAGE"]
-), "set environment MINIWDL__AWS__WORKFLOW_IMAGE to repo:digest"
-assert (
-    "MINIWDL__AWS__WORKFLOW_QUEUE" in os.environ
-), "set MINIWDL__AWS__WORKFLOW_QUEUE to Batch queue name"
-assert (
-    "MINIWDL_AWS_TEST_BUCKET" in os.environ
-), "set MINIWDL_AWS_TEST_BUCKET to test S3 bucket (name only)"
-
-
-@pytest.fixture(scope="module")
-def aws_batch():
-    return boto3.client("batch", region_name=os.environ["AWS_DEFAULT_REGION"])
-
-
-def batch_miniwdl(aws_batch, args, env=None, upload=None, cache=False):
-    """
-    Submit & await a Batch job to run cmd in the miniwdl_aws container (usually ~miniwdl run~
-    to launch other Batch jobs in turn)
-    """
-    cmd = ["python3", "-m", "miniwdl_aws"]
-    cmd.extend(args)
-    cmd.append("--follow")
-    if not cache:
-        cmd.append("--no-cache")
-    if upload:
-        if not upload.endswith("/"):
-            upload += "/"
-        cmd.extend(["--s3upload", upload])
-
-    exit_code = subprocess.run(
-        cmd, cwd=os.path.dirname(os.path.dirname(__file__)), check=False, env=env
-    ).returncode
-
-    if exit_code != 0:
-        ans = {"success": False, "exit_code": exit_code}
-        if upload:
-            error = get_s3uri(upload + "error.json")
-            if error:
-                ans["error"] = json.loads(error)
-        return ans
-
-    ans = {"success": True}
-    if upload:
-        outputs = get_s3uri(upload + "outputs.json")
-        if outputs:
-            ans["outputs"] = json.loads(outputs)
-    return ans
-
-
-def get_s3uri(uri):
-    """
-    Download bytes from s3:// URI
-    """
-    try:
-        assert uri.startswith("s3://")
-        parts = urlparse(uri)
-        obj = boto3.resource("s3", region_name=os.environ["AWS_DEFAULT_REGION"]).Object(
-            parts.netloc, parts.path.lstrip("/")
-        )
-        return obj.get()["Body"].read()
-    except Exception as exn:
-        if "NoSuchKey" in str(exn):
-            return None
-        raise
+import string
+import concurrent.futures
+from helpers import batch_miniwdl, get_s3uri, get_s3uris, s3_staged
 
 
 def test_miniwdl_run_self_test(aws_batch):
@@ -95,14 +25,6 @@ def test_miniwdl_run_self_test(aws_batch):
     )
 
 
-@pytest.fixture(scope="session")
-def test_s3_folder():
-    """
-    S3 folder for this test session
-    """
-    return f"s3://{os.environ['MINIWDL_AWS_TEST_BUCKET']}/{datetime.today().strftime('%Y%m%d_%H%M%S')}/"
-
-
 def test_retry_streams(aws_batch, test_s3_folder):
     env = dict(os.environ)
     env["MINIWDL__AWS__RETRY_WAIT"] = "1"
@@ -121,17 +43,22 @@ def test_retry_streams(aws_batch, test_s3_folder):
     assert len(rslt["outputs"]["test_retry_streams.messages"]) == 4
     assert len(rslt["outputs"]["test_retry_streams.stdouts"]) == 4
     assert len(rslt["outputs"]["test_retry_streams.stderrs"]) == 4
+    contents = get_s3uris(
+        rslt["outputs"]["test_retry_streams.messages"]
+        + rslt["outputs"]["test_retry_streams.stdouts"]
+        + rslt["outputs"]["test_retry_streams.stderrs"]
+    )
     for i in range(4):
         assert (
-            get_s3uri(rslt["outputs"]["test_retry_streams.messages"][i]).decode().strip()
+            contents[rslt["outputs"]["test_retry_streams.messages"][i]].decode().strip()
             == "Hello, stdout!"
         )
         assert (
-            get_s3uri(rslt["outputs"]["test_retry_streams.stdouts"][i]).decode().strip()
+            contents[rslt["outputs"]["test_retry_streams.stdouts"][i]].decode().strip()
             == "Hello, stdout!"
         )
         assert (
-            get_s3uri(rslt["outputs"]["test_retry_streams.stderrs"][i]).decode().strip()
+            contents[rslt["outputs"]["test_retry_streams.stderrs"][i]].decode().strip()
             == "Hello, stderr!"
         )
 
@@ -141,8 +68,14 @@ def test_assemble_refbased(aws_batch, test_s3_folder):
         aws_batch,
         [
             "https://github.com/broadinstitute/viral-pipelines/raw/v2.1.19.0/pipes/WDL/workflows/assemble_refbased.wdl",
-            "reads_unmapped_bams=https://github.com/broadinstitute/viral-pipelines/raw/v2.1.19.0/test/input/G5012.3.testreads.bam",
-            "reference_fasta=https://github.com/broadinstitute/viral-pipelines/raw/v2.1.19.0/test/input/ebov-makona.fasta",
+            "reads_unmapped_bams="
+            + s3_staged(
+                "https://github.com/broadinstitute/viral-pipelines/raw/v2.1.19.0/test/input/G5012.3.testreads.bam"
+            ),
+            "reference_fasta="
+            + s3_staged(
+                "https://github.com/broadinstitute/viral-pipelines/raw/v2.1.19.0/test/input/ebov-makona.fasta"
+            ),
             "sample_name=G5012.3",
             "--dir",
             "/mnt/efs/miniwdl_aws_tests",
@@ -175,14 +108,10 @@ def test_termination(aws_batch, test_s3_folder):
     assert not rslt["success"]
     assert rslt["error"]["cause"]["error"] == "CommandFailed"
     assert rslt["error"]["cause"]["exit_status"] == 42
-    assert (
-        "This is the end, my only friend"
-        in get_s3uri(rslt["error"]["cause"]["stderr_s3file"]).decode()
-    )
-    assert (
-        "I'll never look into your eyes again"
-        in get_s3uri(rslt["error"]["cause"]["stdout_s3file"]).decode()
-    )
+    cause = rslt["error"]["cause"]
+    contents = get_s3uris([cause["stderr_s3file"], cause["stdout_s3file"]])
+    assert "This is the end, my only friend" in contents[cause["stderr_s3file"]].decode()
+    assert "I'll never look into your eyes again" in contents[cause["stdout_s3file"]].decode()
     assert time.time() - t0 < 600
 
 
@@ -208,29 +137,61 @@ def test_nonexistent_docker(aws_batch, test_s3_folder):
     assert "CannotPullContainerError" in str(rslt["error"])
 
 
-def test_call_cache(aws_batch, test_s3_folder):
+@pytest.fixture(scope="module")
+def call_cache_primed(aws_batch):
     """
-    Call cache works (short-term, where previous outputs remain on /mnt/shared)
+    Run the first (cache-priming) workflows of test_call_cache and test_call_cache_one_task
+    concurrently, since they're independent of each other; returns their start time & results
     """
     t0 = int(time.time())
-    # run once to prime cache
-    rslt = batch_miniwdl(
-        aws_batch,
-        [
-            "/var/miniwdl_aws_test_assets/test_call_cache.wdl",
-            "timestamp_in=",
-            str(t0),
-            "names=Alice",
-            "names=Bob",
-            "names=Carol",
-            "fail=true",
-            "--verbose",
-            "--dir",
-            "/mnt/efs/miniwdl_aws_tests",
-        ],
-        cache=False,
-    )
-    assert not rslt["success"]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+        call_cache = pool.submit(
+            batch_miniwdl,
+            aws_batch,
+            [
+                "/var/miniwdl_aws_test_assets/test_call_cache.wdl",
+                "timestamp_in=",
+                str(t0),
+                "names=Alice",
+                "names=Bob",
+                "fail=true",
+                "--verbose",
+                "--dir",
+                "/mnt/efs/miniwdl_aws_tests",
+            ],
+            cache=False,
+        )
+        call_cache_one_task = pool.submit(
+            batch_miniwdl,
+            aws_batch,
+            [
+                "/var/miniwdl_aws_test_assets/test_call_cache.wdl",
+                "timestamp_in=",
+                str(t0),
+                "name=Alyssa",
+                "--task",
+                "write_name",
+                "--verbose",
+                "--dir",
+                "/mnt/efs/miniwdl_aws_tests",
+            ],
+            cache=False,
+        )
+        return {
+            "t0": t0,
+            "call_cache": call_cache.result(),
+            "call_cache_one_task": call_cache_one_task.result(),
+        }
+
+
+@pytest.mark.xdist_group("call_cache")  # share call_cache_primed
+def test_call_cache(aws_batch, test_s3_folder, call_cache_primed):
+    """
+    Call cache works (short-term, where previous outputs remain on /mnt/shared)
+    """
+    # first run (failing) primed the cache
+    t0 = call_cache_primed["t0"]
+    assert not call_cache_primed["call_cache"]["success"]
 
     # run again where a subset of calls should be reused
     t1 = int(time.time())
@@ -256,33 +217,21 @@ def test_call_cache(aws_batch, test_s3_folder):
     assert t0 <= rslt["outputs"]["test_call_cache.timestamps_out"][0] <= t1
     assert t0 <= rslt["outputs"]["test_call_cache.timestamps_out"][1] <= t1
     assert rslt["outputs"]["test_call_cache.timestamps_out"][2] > t1
-    assert "Hello, Alice!" in get_s3uri(rslt["outputs"]["test_call_cache.messages"][0]).decode()
-    assert "Hello, Bob!" in get_s3uri(rslt["outputs"]["test_call_cache.messages"][1]).decode()
-    assert "Hello, Xavier!" in get_s3uri(rslt["outputs"]["test_call_cache.messages"][2]).decode()
+    messages = rslt["outputs"]["test_call_cache.messages"]
+    contents = get_s3uris(messages)
+    assert "Hello, Alice!" in contents[messages[0]].decode()
+    assert "Hello, Bob!" in contents[messages[1]].decode()
+    assert "Hello, Xavier!" in contents[messages[2]].decode()
 
 
-def test_call_cache_one_task(aws_batch, test_s3_folder):
+@pytest.mark.xdist_group("call_cache")  # share call_cache_primed
+def test_call_cache_one_task(aws_batch, test_s3_folder, call_cache_primed):
     """
     Short-term call cache of one task (where the entire run outputs, not just a portion thereof,
     are sourced from the cache.)
     """
-    t0 = int(time.time())
-    rslt = batch_miniwdl(
-        aws_batch,
-        [
-            "/var/miniwdl_aws_test_assets/test_call_cache.wdl",
-            "timestamp_in=",
-            str(t0),
-            "name=Alyssa",
-            "--task",
-            "write_name",
-            "--verbose",
-            "--dir",
-            "/mnt/efs/miniwdl_aws_tests",
-        ],
-        cache=False,
-    )
-    assert rslt["success"]
+    t0 = call_cache_primed["t0"]
+    assert call_cache_primed["call_cache_one_task"]["success"]
 
     t1 = int(time.time())
     rslt = batch_miniwdl(
@@ -362,48 +311,12 @@ def test_directory(aws_batch, test_s3_folder):
     assert rslt["outputs"]["test_directory.file_count"] > 100
 
 
-def test_shipping_local_wdl(aws_batch, tmp_path, test_s3_folder):
-    with open(tmp_path / "outer.wdl", "w") as outfile:
-        print(
-            """
-            version development
-            import "inner.wdl"
-
-            workflow outer {
-                input {
-                    String who
-                }
-                call inner.hello { input: who }
-                output {
-                    String message = hello.message
-                }
-            }
-            """,
-            file=outfile,
-        )
-    with open(tmp_path / "inner.wdl", "w") as outfile:
-        print(
-            """
-            version development
-
-            task hello {
-                input {
-                    String who
-                }
-                command {
-                    echo 'Hello, ~{who}!'
-                }
-                output {
-                    String message = read_string(stdout())
-                }
-            }
-            """,
-            file=outfile,
-        )
+def test_shipping_local_wdl(aws_batch, test_s3_folder):
+    # outer.wdl imports inner.wdl alongside it; miniwdl-aws-submit should zip & ship both
     rslt = batch_miniwdl(
         aws_batch,
         [
-            str(tmp_path / "outer.wdl"),
+            os.path.join(os.path.dirname(__file__), "assets/shipping_local_wdl/outer.wdl"),
             "who=world",
             "--dir",
             "/mnt/efs/miniwdl_aws_tests",
@@ -414,7 +327,8 @@ def test_shipping_local_wdl(aws_batch, tmp_path, test_s3_folder):
 
 
 def test_shipping_local_wdl_error(aws_batch, tmp_path, test_s3_folder):
-    almost_big_str = "".join(chr(random.randrange(ord("A"), ord("Z"))) for _ in range(42000))
+    # random (incompressible) content, so that the zipped WDL's size tracks the string length
+    almost_big_str = "".join(random.choices(string.ascii_uppercase[:25], k=42000))
     with open(tmp_path / "almost_big.wdl", "w") as outfile:
         print(
             """
@@ -445,7 +359,7 @@ def test_shipping_local_wdl_error(aws_batch, tmp_path, test_s3_folder):
     assert rslt["outputs"]["outer.big"] == almost_big_str
 
     # Test for reasonable error when zipped WDL is too large
-    big_str = "".join(chr(random.randrange(ord("A"), ord("Z"))) for _ in range(50000))
+    big_str = "".join(random.choices(string.ascii_uppercase[:25], k=50000))
     with open(tmp_path / "big.wdl", "w") as outfile:
         print(
             """
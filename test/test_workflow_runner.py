@@ -0,0 +1,33 @@
+import pytest
+from miniwdl_aws.cli_workflow_runner import check_run
+
+
+def test_check_run_accepts():
+    body = {
+        "command": ["miniwdl-run-s3upload", "s3://bucket/hello.wdl", "--dir", "/mnt/efs/run"],
+        "environment": {"MINIWDL__AWS__TASK_QUEUE": "tasks", "WDL_ZIP": "XQAAgAD"},
+    }
+    assert check_run(body) == (body["command"], body["environment"])
+    assert check_run({"command": ["miniwdl", "run_self_test", "--dir", "/mnt/efs/x"]}) == (
+        ["miniwdl", "run_self_test", "--dir", "/mnt/efs/x"],
+        {},
+    )
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"command": ["bash", "-c", "id"]},
+        {"command": ["/usr/local/bin/miniwdl-run-s3upload", "hello.wdl"]},
+        {"command": ["miniwdl", "run", "hello.wdl"]},
+        {"command": []},
+        {"command": "miniwdl-run-s3upload hello.wdl"},
+        {"command": ["miniwdl-run-s3upload", 42]},
+        {"command": ["miniwdl-run-s3upload"], "environment": {"LD_PRELOAD": "/tmp/x.so"}},
+        {"command": ["miniwdl-run-s3upload"], "environment": {"MINIWDL__X": 1}},
+        {"command": ["miniwdl-run-s3upload"], "environment": ["MINIWDL__X=1"]},
+    ],
+)
+def test_check_run_rejects(body):
+    with pytest.raises(ValueError):
+        check_run(body)